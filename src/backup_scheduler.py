@@ -1,162 +1,230 @@
 import threading
+import heapq
 import time
-import schedule
 from datetime import datetime, timedelta
 import logging
 
 class BackupScheduler:
     """Handles automated database backups on a schedule"""
-    
+
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.logger = logging.getLogger('backup_scheduler')
         self.scheduler_thread = None
         self.running = False
-        
+        self._stop_event = threading.Event()
+        self._heap = []
+        self._next_runs_cache = None
+        self._next_runs_cache_until = None
+
         # Configure backup schedule
         self.setup_schedule()
-    
+
     def setup_schedule(self):
         """Setup the backup schedule"""
+        self._heap = []
+
         # Daily backup at 2 AM
-        schedule.every().day.at("02:00").do(self._daily_backup)
-        
+        self._schedule_job('daily_backup', self._daily_backup, self._next_daily_run)
+
         # Weekly backup on Sunday at 3 AM
-        schedule.every().sunday.at("03:00").do(self._weekly_backup)
-        
+        self._schedule_job('weekly_backup', self._weekly_backup, self._next_weekly_run)
+
         # Backup after every 10 matches (handled separately)
         self.match_counter = 0
         self.matches_per_backup = 10
-    
+
+    def _schedule_job(self, name, callback, next_run_fn):
+        """Push a job onto the deadline heap with its next wall-clock run time"""
+        next_run = next_run_fn()
+        deadline = time.monotonic() + (next_run - datetime.now()).total_seconds()
+        heapq.heappush(self._heap, (deadline, name, next_run, callback, next_run_fn))
+        self._next_runs_cache = None
+
+    @staticmethod
+    def _next_daily_run():
+        """Next 02:00 after now"""
+        now = datetime.now()
+        run = now.replace(hour=2, minute=0, second=0, microsecond=0)
+        if run <= now:
+            run += timedelta(days=1)
+        return run
+
+    @staticmethod
+    def _next_weekly_run():
+        """Next Sunday 03:00 after now"""
+        now = datetime.now()
+        run = now.replace(hour=3, minute=0, second=0, microsecond=0)
+        run += timedelta(days=(6 - now.weekday()) % 7)
+        if run <= now:
+            run += timedelta(days=7)
+        return run
+
     def _daily_backup(self):
         """Create daily backup"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d")
             backup_name = f"daily_backup_{timestamp}.db"
             backup_path = self.db_manager.create_backup(backup_name)
-            
+
             if backup_path:
                 self.logger.info(f"Daily backup created: {backup_path}")
             else:
                 self.logger.error("Failed to create daily backup")
-                
+
         except Exception as e:
             self.logger.error(f"Error during daily backup: {e}")
-    
+
     def _weekly_backup(self):
         """Create weekly backup"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d")
             backup_name = f"weekly_backup_{timestamp}.db"
             backup_path = self.db_manager.create_backup(backup_name)
-            
+
             if backup_path:
                 self.logger.info(f"Weekly backup created: {backup_path}")
-                
+
                 # Keep weekly backups longer (clean up after 8 weeks)
                 self._cleanup_weekly_backups(max_weeks=8)
             else:
                 self.logger.error("Failed to create weekly backup")
-                
+
         except Exception as e:
             self.logger.error(f"Error during weekly backup: {e}")
-    
+
     def _cleanup_weekly_backups(self, max_weeks=8):
         """Clean up old weekly backups"""
         try:
             import os
             backup_dir = self.db_manager.backup_dir
             cutoff_date = datetime.now() - timedelta(weeks=max_weeks)
-            
-            for file in os.listdir(backup_dir):
-                if file.startswith('weekly_backup_') and file.endswith('.db'):
-                    file_path = os.path.join(backup_dir, file)
-                    file_time = datetime.fromtimestamp(os.path.getctime(file_path))
-                    
-                    if file_time < cutoff_date:
-                        os.remove(file_path)
-                        # Also remove JSON backup
-                        json_file = file_path.replace('.db', '.json')
-                        if os.path.exists(json_file):
-                            os.remove(json_file)
-                        self.logger.info(f"Removed old weekly backup: {file}")
-                        
+
+            with os.scandir(backup_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('weekly_backup_') and entry.name.endswith('.db'):
+                        file_time = datetime.fromtimestamp(entry.stat().st_ctime)
+
+                        if file_time < cutoff_date:
+                            os.remove(entry.path)
+                            # Also remove JSON backup
+                            json_file = entry.path.replace('.db', '.json')
+                            if os.path.exists(json_file):
+                                os.remove(json_file)
+                            self.logger.info(f"Removed old weekly backup: {entry.name}")
+
         except Exception as e:
             self.logger.error(f"Error cleaning up weekly backups: {e}")
-    
+
     def trigger_match_backup(self):
         """Trigger backup after match completion"""
         self.match_counter += 1
-        
+
         if self.match_counter >= self.matches_per_backup:
             try:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 backup_name = f"match_milestone_{timestamp}.db"
                 backup_path = self.db_manager.create_backup(backup_name)
-                
+
                 if backup_path:
                     self.logger.info(f"Match milestone backup created: {backup_path}")
                     self.match_counter = 0  # Reset counter
-                    
+
             except Exception as e:
                 self.logger.error(f"Error during match milestone backup: {e}")
-    
+
     def start(self):
         """Start the backup scheduler"""
         if self.running:
             self.logger.warning("Backup scheduler is already running")
             return
-        
+
         self.running = True
+        self._stop_event.clear()
         self.scheduler_thread = threading.Thread(target=self._run_scheduler, daemon=True)
         self.scheduler_thread.start()
         self.logger.info("Backup scheduler started")
-    
+
     def stop(self):
         """Stop the backup scheduler"""
         self.running = False
+        self._stop_event.set()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
         self.logger.info("Backup scheduler stopped")
-    
+
     def _run_scheduler(self):
-        """Run the scheduler in a separate thread"""
+        """Sleep until the next deadline instead of polling every minute"""
         while self.running:
             try:
-                schedule.run_pending()
-                time.sleep(60)  # Check every minute
+                if not self._heap:
+                    # Nothing scheduled; wait until stop() or a reschedule
+                    if self._stop_event.wait(timeout=60):
+                        return
+                    continue
+
+                deadline, name, next_run, callback, next_run_fn = self._heap[0]
+                delay = deadline - time.monotonic()
+
+                if delay > 0:
+                    # wait() returns True when stop() fires the event
+                    if self._stop_event.wait(timeout=delay):
+                        return
+                    continue
+
+                heapq.heappop(self._heap)
+                try:
+                    callback()
+                except Exception as e:
+                    self.logger.error(f"Error running scheduled job {name}: {e}")
+
+                # Re-arm the job for its next occurrence
+                self._schedule_job(name, callback, next_run_fn)
+
             except Exception as e:
                 self.logger.error(f"Error in backup scheduler: {e}")
-                time.sleep(60)  # Continue running even if there's an error
-    
+                if self._stop_event.wait(timeout=60):
+                    return
+
     def get_next_backup_times(self):
         """Get information about next scheduled backups"""
-        jobs = schedule.jobs
+        # Result only changes when a job fires or is rescheduled, so cache
+        # it until the earliest next_run passes
+        if (self._next_runs_cache is not None
+                and self._next_runs_cache_until is not None
+                and datetime.now() < self._next_runs_cache_until):
+            return self._next_runs_cache
+
         next_runs = []
-        
-        for job in jobs:
+        earliest = None
+
+        for deadline, name, next_run, callback, next_run_fn in sorted(self._heap):
             next_runs.append({
-                'job': str(job.job_func.__name__),
-                'next_run': job.next_run.isoformat() if job.next_run else None
+                'job': name,
+                'next_run': next_run.isoformat()
             })
-        
+            if earliest is None or next_run < earliest:
+                earliest = next_run
+
+        self._next_runs_cache = next_runs
+        self._next_runs_cache_until = earliest
+
         return next_runs
-    
+
     def force_backup(self, backup_type="manual"):
         """Force an immediate backup"""
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             backup_name = f"{backup_type}_backup_{timestamp}.db"
             backup_path = self.db_manager.create_backup(backup_name)
-            
+
             if backup_path:
                 self.logger.info(f"Manual backup created: {backup_path}")
                 return backup_path
             else:
                 self.logger.error("Failed to create manual backup")
                 return None
-                
+
         except Exception as e:
             self.logger.error(f"Error during manual backup: {e}")
             return None
-
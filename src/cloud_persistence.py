@@ -3,7 +3,11 @@ import json
 import sqlite3
 import logging
 from datetime import datetime
-import base64
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 class CloudPersistence:
     """Handles data persistence across deployments using cloud storage"""
@@ -25,16 +29,32 @@ class CloudPersistence:
             if not os.path.exists(self.db_manager.db_path):
                 self.logger.warning("Database file does not exist, cannot export")
                 return False
-            
-            # Export database to JSON
-            data = self._export_database_to_json()
-            
+
+            # Snapshot the database with VACUUM INTO - the SQLite page format
+            # is far denser than JSON and preserves the exact schema
+            # (indexes, constraints) that the JSON rebuild used to lose
+            snapshot_path = f"{self.db_manager.db_path}.cloud_snapshot"
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+
+            conn = sqlite3.connect(self.db_manager.db_path)
+            try:
+                conn.execute("VACUUM INTO ?", (snapshot_path,))
+            finally:
+                conn.close()
+
+            import base64
+
+            with open(snapshot_path, 'rb') as f:
+                db_bytes = f.read()
+            os.remove(snapshot_path)
+
             # Add metadata
             export_data = {
                 'timestamp': datetime.now().isoformat(),
-                'version': '1.0',
-                'export_type': 'full_database',
-                'data': data
+                'version': '2.0',
+                'export_type': 'db_snapshot',
+                'db': base64.b64encode(db_bytes).decode('ascii')
             }
             
             # Store in cloud (using a simple approach)
@@ -68,8 +88,12 @@ class CloudPersistence:
                 self.logger.info(f"Current database backed up to {backup_path}")
             
             # Import data to database
-            success = self._import_json_to_database(cloud_data['data'])
-            
+            if cloud_data.get('db'):
+                success = self._import_snapshot_to_database(cloud_data['db'])
+            else:
+                # Legacy JSON envelope
+                success = self._import_json_to_database(cloud_data['data'])
+
             if success:
                 self.logger.info("Database imported from cloud successfully")
                 return True
@@ -84,20 +108,21 @@ class CloudPersistence:
     def _export_database_to_json(self):
         """Export SQLite database to JSON format"""
         try:
-            conn = sqlite3.connect(self.db_manager.db_path)
-            conn.row_factory = sqlite3.Row
-            
+            conn = sqlite3.connect(self.db_manager.db_path, cached_statements=256)
+
             data = {}
-            
-            # Export all tables
+
+            # Export all tables as columns + row tuples rather than one dict
+            # per row - far cheaper to build and serialize for large tables
             cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
             tables = [row[0] for row in cursor.fetchall()]
-            
+
             for table in tables:
                 cursor = conn.execute(f"SELECT * FROM {table}")
-                rows = cursor.fetchall()
-                data[table] = [dict(row) for row in rows]
-            
+                cursor.arraysize = 10000
+                columns = [description[0] for description in cursor.description]
+                data[table] = {'columns': columns, 'rows': cursor.fetchall()}
+
             conn.close()
             return data
             
@@ -105,24 +130,65 @@ class CloudPersistence:
             self.logger.error(f"Failed to export database to JSON: {e}")
             return None
     
+    def _import_snapshot_to_database(self, db_b64):
+        """Restore the database from a base64-encoded SQLite snapshot"""
+        try:
+            import base64
+
+            # Ensure database directory exists
+            os.makedirs(os.path.dirname(self.db_manager.db_path), exist_ok=True)
+
+            tmp_path = f"{self.db_manager.db_path}.cloud_import_tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(base64.b64decode(db_b64))
+
+            # Sanity-check the snapshot before moving it into place
+            conn = sqlite3.connect(tmp_path)
+            try:
+                conn.execute("SELECT name FROM sqlite_master LIMIT 1")
+            finally:
+                conn.close()
+
+            os.replace(tmp_path, self.db_manager.db_path)
+
+            self.logger.info("Database imported from snapshot successfully")
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to import snapshot to database: {e}")
+            return False
+
     def _import_json_to_database(self, data):
         """Import JSON data to SQLite database"""
         try:
             # Ensure database directory exists
             os.makedirs(os.path.dirname(self.db_manager.db_path), exist_ok=True)
             
-            # Create new database
-            conn = sqlite3.connect(self.db_manager.db_path)
-            
+            # Create new database; keep every per-table INSERT plan hot in
+            # the statement cache for the whole import
+            conn = sqlite3.connect(self.db_manager.db_path, cached_statements=256)
+
+            # Amortize journal/fsync cost across each table's batch
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+
             # Import data for each table
-            for table_name, rows in data.items():
+            for table_name, table_data in data.items():
+                if isinstance(table_data, dict):
+                    # Current layout: {'columns': [...], 'rows': [[...], ...]}
+                    columns = table_data.get('columns', [])
+                    rows = table_data.get('rows', [])
+                else:
+                    # Legacy layout: list of per-row dicts
+                    if not table_data:
+                        continue
+                    columns = list(table_data[0].keys())
+                    rows = [[row[col] for col in columns] for row in table_data]
+
                 if not rows:
                     continue
-                
-                # Create table structure based on first row
-                first_row = rows[0]
-                columns = list(first_row.keys())
-                
+
                 # Create table (this is a simplified approach)
                 if table_name == 'players':
                     conn.execute('''
@@ -168,17 +234,17 @@ class CloudPersistence:
                         )
                     ''')
                 
-                # Insert data
-                for row in rows:
-                    placeholders = ', '.join(['?' for _ in columns])
-                    values = [row[col] for col in columns]
-                    
-                    try:
-                        conn.execute(f"INSERT OR REPLACE INTO {table_name} ({', '.join(columns)}) VALUES ({placeholders})", values)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to insert row in {table_name}: {e}")
-            
-            conn.commit()
+                # Insert data in one prepared-statement batch per table
+                placeholders = ','.join('?' * len(columns))
+                insert_sql = f"INSERT OR REPLACE INTO {table_name} ({','.join(columns)}) VALUES ({placeholders})"
+
+                try:
+                    conn.executemany(insert_sql, rows)
+                    conn.commit()
+                except Exception as e:
+                    conn.rollback()
+                    self.logger.warning(f"Failed to insert rows in {table_name}: {e}")
+
             conn.close()
             
             self.logger.info("Database imported from JSON successfully")
@@ -197,23 +263,39 @@ class CloudPersistence:
             os.makedirs(cloud_backup_dir, exist_ok=True)
             
             cloud_file = os.path.join(cloud_backup_dir, 'squash_data_cloud.json')
-            
-            with open(cloud_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            
-            self.logger.info(f"Data stored in cloud backup file: {cloud_file}")
-            
-            # Also create a downloadable backup
+
+            # Serialize once and write the payload to disk once; the second
+            # destination is hardlinked rather than rewritten
+            if orjson is not None:
+                payload = orjson.dumps(data, default=str)
+            else:
+                payload = json.dumps(data, default=str).encode('utf-8')
+
             download_backup_dir = '/tmp/squash_download_backup'
             os.makedirs(download_backup_dir, exist_ok=True)
-            
+
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             download_file = os.path.join(download_backup_dir, f'squash_backup_{timestamp}.json')
-            
-            with open(download_file, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            
+
+            with open(download_file, 'wb') as f:
+                f.write(payload)
+
             self.logger.info(f"Downloadable backup created: {download_file}")
+
+            # Point the cloud backup file at the same bytes via a hardlink,
+            # swapped in atomically so readers never see a partial file.
+            # Fall back to a plain write across filesystems.
+            try:
+                tmp_link = f"{cloud_file}.tmp"
+                if os.path.exists(tmp_link):
+                    os.remove(tmp_link)
+                os.link(download_file, tmp_link)
+                os.replace(tmp_link, cloud_file)
+            except OSError:
+                with open(cloud_file, 'wb') as f:
+                    f.write(payload)
+
+            self.logger.info(f"Data stored in cloud backup file: {cloud_file}")
             
             return True
             
@@ -227,9 +309,10 @@ class CloudPersistence:
             cloud_file = '/tmp/squash_cloud_backup/squash_data_cloud.json'
             
             if os.path.exists(cloud_file):
-                with open(cloud_file, 'r') as f:
-                    data = json.load(f)
-                
+                with open(cloud_file, 'rb') as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
                 self.logger.info("Data retrieved from cloud backup file")
                 return data
             else:
@@ -247,22 +330,27 @@ class CloudPersistence:
             local_has_data = False
             if os.path.exists(self.db_manager.db_path):
                 conn = sqlite3.connect(self.db_manager.db_path)
-                cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
+                cursor = conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' "
+                    "AND name IN ('players', 'sessions', 'matches');"
+                )
                 tables = [row[0] for row in cursor.fetchall()]
-                
-                for table in ['players', 'sessions', 'matches']:
-                    if table in tables:
-                        cursor = conn.execute(f"SELECT COUNT(*) FROM {table}")
-                        count = cursor.fetchone()[0]
-                        if count > 0:
-                            local_has_data = True
-                            break
-                
+
+                if tables:
+                    # One short-circuiting probe instead of a COUNT(*) per
+                    # table - EXISTS reads at most one row per table
+                    probe = "SELECT " + " OR ".join(
+                        f"EXISTS(SELECT 1 FROM {table})" for table in tables
+                    )
+                    local_has_data = bool(conn.execute(probe).fetchone()[0])
+
                 conn.close()
             
             # Check if cloud has data
             cloud_data = self._retrieve_from_cloud()
-            cloud_has_data = cloud_data is not None and cloud_data.get('data')
+            cloud_has_data = cloud_data is not None and (
+                cloud_data.get('db') or cloud_data.get('data')
+            )
             
             if cloud_has_data and not local_has_data:
                 # Import from cloud
@@ -293,16 +381,16 @@ class CloudPersistence:
                 return []
             
             files = []
-            for filename in os.listdir(download_backup_dir):
-                if filename.endswith('.json'):
-                    file_path = os.path.join(download_backup_dir, filename)
-                    stat = os.stat(file_path)
-                    files.append({
-                        'filename': filename,
-                        'path': file_path,
-                        'size': stat.st_size,
-                        'created': datetime.fromtimestamp(stat.st_ctime).isoformat()
-                    })
+            with os.scandir(download_backup_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json'):
+                        stat = entry.stat()
+                        files.append({
+                            'filename': entry.name,
+                            'path': entry.path,
+                            'size': stat.st_size,
+                            'created': datetime.fromtimestamp(stat.st_ctime).isoformat()
+                        })
             
             # Sort by creation time (newest first)
             files.sort(key=lambda x: x['created'], reverse=True)
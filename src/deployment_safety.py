@@ -2,15 +2,81 @@ import os
 import shutil
 import json
 import sqlite3
+import subprocess
+import atexit
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import logging
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+def _compress_file(src_path, dst_path):
+    """Stream-compress src into dst with zstd level 3"""
+    compressor = zstd.ZstdCompressor(level=3)
+    with open(src_path, 'rb') as fsrc, open(dst_path, 'wb') as fdst:
+        compressor.copy_stream(fsrc, fdst)
+
+def _decompress_file(src_path, dst_path):
+    """Stream-decompress a zstd-compressed src into dst"""
+    decompressor = zstd.ZstdDecompressor()
+    with open(src_path, 'rb') as fsrc, open(dst_path, 'wb') as fdst:
+        decompressor.copy_stream(fsrc, fdst)
+
+def _fast_copy(src_path, dst_path):
+    """Copy a file with os.sendfile (in-kernel, ~one syscall per 2 GB),
+    falling back to a 4 MiB-buffered copyfileobj where unavailable"""
+    with open(src_path, 'rb') as fsrc, open(dst_path, 'wb') as fdst:
+        try:
+            size = os.fstat(fsrc.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except (AttributeError, OSError):
+            shutil.copyfileobj(fsrc, fdst, length=4 * 1024 * 1024)
+    # Preserve timestamps/mode to keep copy2 semantics
+    shutil.copystat(src_path, dst_path)
+
+def _copy_or_link(src_path, dst_path):
+    """Hardlink dst to src when both sit on the same filesystem (zero data
+    bytes moved), falling back to a real copy across devices.
+
+    Note hardlinked backups share one inode: deleting one name does not
+    reclaim the space until every link is gone.
+    """
+    try:
+        if os.path.exists(dst_path):
+            os.remove(dst_path)
+        os.link(src_path, dst_path)
+    except OSError:
+        # EXDEV (different filesystem) or EPERM (fs forbids links)
+        _fast_copy(src_path, dst_path)
+
 class DeploymentSafety:
     """Ensures data persistence across deployments with multiple safeguards"""
     
     def __init__(self, db_manager):
         self.db_manager = db_manager
         self.logger = logging.getLogger('deployment_safety')
+        # Per-location cache for find_latest_backup keyed on directory
+        # mtime: unchanged directories are not rescanned
+        self._latest_cache = {}
+
+        # Lazily-opened shared read-only connection; reused by exports and
+        # integrity checks instead of paying connect + cold-cache cost each
+        # call
+        self._ro_conn = None
         
         # Multiple backup locations for redundancy
         self.backup_locations = [
@@ -26,106 +92,310 @@ class DeploymentSafety:
             except Exception as e:
                 self.logger.warning(f"Could not create backup location {location}: {e}")
     
+    def _get_ro_conn(self):
+        """Get (lazily opening) the shared read-only connection with bulk-read
+        pragmas applied"""
+        if self._ro_conn is None:
+            conn = sqlite3.connect(
+                f"file:{self.db_manager.db_path}?mode=ro&cache=shared",
+                uri=True, check_same_thread=False
+            )
+            conn.execute("PRAGMA cache_size=-65536")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA mmap_size=268435456")
+            conn.execute("PRAGMA query_only=1")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._ro_conn = conn
+            atexit.register(self._close_ro_conn)
+        return self._ro_conn
+
+    def _close_ro_conn(self):
+        """Close and drop the cached read-only connection"""
+        if self._ro_conn is not None:
+            try:
+                self._ro_conn.close()
+            except Exception:
+                pass
+            self._ro_conn = None
+
     def create_deployment_backup(self):
         """Create backups in multiple locations before deployment"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_name = f"pre_deployment_backup_{timestamp}"
-        
-        successful_backups = []
-        
-        for location in self.backup_locations:
+
+        if not os.path.exists(self.db_manager.db_path):
+            return []
+
+        # Produce the DB snapshot and JSON export once in a staging dir;
+        # each location replicates them rather than re-scanning the
+        # database three times
+        staging_dir = tempfile.gettempdir()
+        db_source = os.path.join(staging_dir, f"{backup_name}.db")
+        # SQLite pages and JSON both compress well, so backups are stored
+        # zstd-compressed when the module is available (each location
+        # stores a fraction of the raw bytes); restore handles both forms
+        json_source = os.path.join(
+            staging_dir, f"{backup_name}.json.zst" if zstd is not None else f"{backup_name}.json")
+
+        try:
+            # Create the SQLite snapshot via the online backup API, which
+            # copies pages under a read lock and is safe against
+            # concurrent writers (a raw file copy can tear pages)
+            src = self._get_ro_conn()
+            dst = sqlite3.connect(db_source)
             try:
-                if not os.path.exists(location):
-                    continue
-                    
-                # Create SQLite backup
-                db_backup_path = os.path.join(location, f"{backup_name}.db")
-                if os.path.exists(self.db_manager.db_path):
-                    shutil.copy2(self.db_manager.db_path, db_backup_path)
-                    
-                    # Create JSON backup for additional safety
-                    json_backup_path = os.path.join(location, f"{backup_name}.json")
-                    self._export_to_json(json_backup_path)
-                    
-                    # Create metadata file
-                    metadata_path = os.path.join(location, f"{backup_name}_metadata.json")
-                    metadata = {
-                        'timestamp': timestamp,
-                        'original_db_path': self.db_manager.db_path,
-                        'backup_type': 'pre_deployment',
-                        'db_size': os.path.getsize(self.db_manager.db_path),
-                        'created_at': datetime.now().isoformat()
-                    }
-                    with open(metadata_path, 'w') as f:
-                        json.dump(metadata, f, indent=2)
-                    
-                    successful_backups.append(location)
-                    self.logger.info(f"Deployment backup created at {location}")
-                    
-            except Exception as e:
-                self.logger.error(f"Failed to create backup at {location}: {e}")
-        
-        return successful_backups
+                src.backup(dst, pages=1024)
+            finally:
+                dst.close()
+
+            if zstd is not None:
+                compressed = f"{db_source}.zst"
+                _compress_file(db_source, compressed)
+                os.remove(db_source)
+                db_source = compressed
+
+            self._export_to_json(json_source)
+
+            # The backup locations sit on independent mounts, so write them
+            # in parallel - wall time becomes the slowest location, not the
+            # sum
+            with ThreadPoolExecutor(max_workers=len(self.backup_locations)) as executor:
+                results = list(executor.map(
+                    lambda location: self._backup_one_location(
+                        location, backup_name, timestamp, db_source, json_source),
+                    self.backup_locations
+                ))
+        finally:
+            for source in (db_source, json_source):
+                if os.path.exists(source):
+                    os.remove(source)
+
+        return [location for location in results if location]
+
+    def _backup_one_location(self, location, backup_name, timestamp, db_source, json_source):
+        """Replicate the staged DB + JSON backups into one location"""
+        try:
+            if not os.path.exists(location):
+                return None
+
+            # Same-filesystem locations get hardlinks (no data copied);
+            # cross-device locations fall back to a fast copy. The staged
+            # basenames already carry the .zst suffix when compressed.
+            db_backup_path = os.path.join(location, os.path.basename(db_source))
+            _copy_or_link(db_source, db_backup_path)
+
+            json_backup_path = os.path.join(location, os.path.basename(json_source))
+            _copy_or_link(json_source, json_backup_path)
+
+            # Create metadata file
+            metadata_path = os.path.join(location, f"{backup_name}_metadata.json")
+            metadata = {
+                'timestamp': timestamp,
+                'original_db_path': self.db_manager.db_path,
+                'backup_type': 'pre_deployment',
+                'db_size': os.path.getsize(self.db_manager.db_path),
+                'created_at': datetime.now().isoformat()
+            }
+            if orjson is not None:
+                with open(metadata_path, 'wb') as f:
+                    f.write(orjson.dumps(metadata))
+            else:
+                with open(metadata_path, 'w') as f:
+                    json.dump(metadata, f)
+
+            self.logger.info(f"Deployment backup created at {location}")
+            return location
+
+        except Exception as e:
+            self.logger.error(f"Failed to create backup at {location}: {e}")
+            return None
     
     def _export_to_json(self, json_path):
-        """Export database to JSON format"""
+        """Export database to JSON format.
+
+        Prefers the sqlite3 CLI, whose C-level JSON writer beats the
+        Python row loop; falls back to the in-process streaming path when
+        the binary is not on PATH.
+        """
+        if self._export_to_json_via_cli(json_path):
+            self.logger.info(f"JSON export written via sqlite3 CLI: {json_path}")
+            return
+        self._export_to_json_streaming(json_path)
+        self.logger.info(f"JSON export written via Python streaming path: {json_path}")
+
+    def _export_to_json_via_cli(self, json_path):
+        """Export via `sqlite3 -readonly ... '.mode json'`, piping each
+        table's output straight into the destination; returns False when
+        the CLI is unavailable or fails so the caller can fall back"""
+        if shutil.which('sqlite3') is None:
+            return False
+
         try:
-            conn = sqlite3.connect(self.db_manager.db_path)
+            conn = self._get_ro_conn()
+            cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
+            tables = [row[0] for row in cursor.fetchall()]
+
+            if json_path.endswith('.zst'):
+                sink = zstd.ZstdCompressor(level=3).stream_writer(
+                    open(json_path, 'wb'), closefd=True)
+            else:
+                sink = open(json_path, 'wb')
+
+            with sink as f:
+                f.write(b'{')
+                for index, table in enumerate(tables):
+                    if index:
+                        f.write(b',')
+                    f.write(json.dumps(table).encode('utf-8') + b':')
+
+                    proc = subprocess.Popen(
+                        ['sqlite3', '-readonly', self.db_manager.db_path,
+                         '.mode json', f'SELECT * FROM "{table}"'],
+                        stdout=subprocess.PIPE
+                    )
+                    wrote = False
+                    while True:
+                        chunk = proc.stdout.read(1024 * 1024)
+                        if not chunk:
+                            break
+                        f.write(chunk)
+                        wrote = True
+                    if proc.wait() != 0:
+                        raise RuntimeError(f"sqlite3 CLI exited {proc.returncode}")
+                    if not wrote:
+                        # The CLI prints nothing for an empty table
+                        f.write(b'[]')
+                f.write(b'}')
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"sqlite3 CLI export failed, falling back: {e}")
+            return False
+
+    def _export_to_json_streaming(self, json_path):
+        """Export database to JSON format, streaming rows so peak memory
+        stays at one row regardless of database size"""
+        def encode(obj):
+            if orjson is not None:
+                return orjson.dumps(obj, default=str)
+            return json.dumps(obj, default=str).encode('utf-8')
+
+        try:
+            conn = self._get_ro_conn()
             conn.row_factory = sqlite3.Row
-            
-            data = {}
-            
+
+            if json_path.endswith('.zst'):
+                sink = zstd.ZstdCompressor(level=3).stream_writer(
+                    open(json_path, 'wb'), closefd=True)
+            else:
+                sink = open(json_path, 'wb')
+
             # Export all tables
             cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
             tables = [row[0] for row in cursor.fetchall()]
-            
-            for table in tables:
-                cursor = conn.execute(f"SELECT * FROM {table}")
-                rows = cursor.fetchall()
-                data[table] = [dict(row) for row in rows]
-            
-            with open(json_path, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            
-            conn.close()
-            
+
+            with sink as f:
+                f.write(b'{')
+                for index, table in enumerate(tables):
+                    if index:
+                        f.write(b',')
+                    f.write(encode(table) + b':[')
+
+                    # Table names come straight from sqlite_master above;
+                    # quoting guards against odd identifiers. fetchmany
+                    # batches amortize per-row sqlite3_step overhead while
+                    # keeping memory bounded.
+                    cursor = conn.execute(f'SELECT * FROM "{table}"')
+                    cursor.arraysize = 10000
+
+                    first_row = True
+                    while True:
+                        chunk = cursor.fetchmany()
+                        if not chunk:
+                            break
+                        for row in chunk:
+                            if not first_row:
+                                f.write(b',')
+                            f.write(encode(dict(row)))
+                            first_row = False
+
+                    f.write(b']')
+                f.write(b'}')
+
         except Exception as e:
             self.logger.error(f"Failed to create JSON backup: {e}")
     
+    def _scan_location_for_latest(self, location):
+        """Scan one backup location, returning its newest (time, info) pair"""
+        best_time = None
+        best_backup = None
+
+        with os.scandir(location) as entries:
+            for entry in entries:
+                if not entry.name.endswith('_metadata.json'):
+                    continue
+                metadata_path = entry.path
+                try:
+                    with open(metadata_path, 'rb') as f:
+                        raw = f.read()
+                    metadata = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+                    backup_time = datetime.fromisoformat(metadata['created_at'])
+                    if best_time is None or backup_time > best_time:
+                        best_time = backup_time
+                        backup_name = entry.name.replace('_metadata.json', '')
+                        # Newer backups are stored zstd-compressed; prefer
+                        # the .zst variant and fall back to the raw file
+                        db_path = os.path.join(location, f"{backup_name}.db.zst")
+                        if not os.path.exists(db_path):
+                            db_path = os.path.join(location, f"{backup_name}.db")
+                        json_path = os.path.join(location, f"{backup_name}.json.zst")
+                        if not os.path.exists(json_path):
+                            json_path = os.path.join(location, f"{backup_name}.json")
+                        best_backup = {
+                            'location': location,
+                            'name': backup_name,
+                            'metadata': metadata,
+                            'db_path': db_path,
+                            'json_path': json_path
+                        }
+                except Exception as e:
+                    self.logger.warning(f"Could not read metadata from {metadata_path}: {e}")
+
+        if best_backup is None:
+            return None
+        return (best_time, best_backup)
+
     def find_latest_backup(self):
         """Find the most recent backup across all locations"""
         latest_backup = None
         latest_time = None
-        
+
         for location in self.backup_locations:
             try:
                 if not os.path.exists(location):
                     continue
-                    
-                for file in os.listdir(location):
-                    if file.endswith('_metadata.json'):
-                        metadata_path = os.path.join(location, file)
-                        try:
-                            with open(metadata_path, 'r') as f:
-                                metadata = json.load(f)
-                            
-                            backup_time = datetime.fromisoformat(metadata['created_at'])
-                            if latest_time is None or backup_time > latest_time:
-                                latest_time = backup_time
-                                backup_name = file.replace('_metadata.json', '')
-                                latest_backup = {
-                                    'location': location,
-                                    'name': backup_name,
-                                    'metadata': metadata,
-                                    'db_path': os.path.join(location, f"{backup_name}.db"),
-                                    'json_path': os.path.join(location, f"{backup_name}.json")
-                                }
-                        except Exception as e:
-                            self.logger.warning(f"Could not read metadata from {metadata_path}: {e}")
-                            
+
+                # A location's newest backup can only change when the
+                # directory itself changes, so key the cached scan on the
+                # directory mtime and skip rereading N metadata files
+                mtime_ns = os.stat(location).st_mtime_ns
+                cached = self._latest_cache.get(location)
+                if cached is not None and cached[0] == mtime_ns:
+                    best = cached[1]
+                else:
+                    best = self._scan_location_for_latest(location)
+                    self._latest_cache[location] = (mtime_ns, best)
+
+                if best is not None:
+                    backup_time, backup_info = best
+                    if latest_time is None or backup_time > latest_time:
+                        latest_time = backup_time
+                        latest_backup = backup_info
+
             except Exception as e:
                 self.logger.warning(f"Could not scan backup location {location}: {e}")
-        
+
         return latest_backup
     
     def restore_from_backup(self, backup_info=None):
@@ -141,7 +411,7 @@ class DeploymentSafety:
             # Create backup of current database before restoring
             if os.path.exists(self.db_manager.db_path):
                 current_backup = f"{self.db_manager.db_path}.pre_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-                shutil.copy2(self.db_manager.db_path, current_backup)
+                _fast_copy(self.db_manager.db_path, current_backup)
                 self.logger.info(f"Current database backed up to {current_backup}")
             
             # Restore from backup
@@ -149,7 +419,16 @@ class DeploymentSafety:
                 # Ensure target directory exists
                 os.makedirs(os.path.dirname(self.db_manager.db_path), exist_ok=True)
                 
-                shutil.copy2(backup_info['db_path'], self.db_manager.db_path)
+                if backup_info['db_path'].endswith('.zst'):
+                    # Decompress beside the target, then swap atomically so
+                    # a failed restore never leaves a truncated database
+                    restore_tmp = f"{self.db_manager.db_path}.restore_tmp"
+                    _decompress_file(backup_info['db_path'], restore_tmp)
+                    os.replace(restore_tmp, self.db_manager.db_path)
+                else:
+                    _fast_copy(backup_info['db_path'], self.db_manager.db_path)
+                # The cached read-only connection now points at stale data
+                self._close_ro_conn()
                 self.logger.info(f"Database restored from {backup_info['db_path']}")
                 return True
             else:
@@ -168,27 +447,28 @@ class DeploymentSafety:
                 return False
             
             # Check if database is readable
-            conn = sqlite3.connect(self.db_manager.db_path)
+            conn = self._get_ro_conn()
             cursor = conn.execute("SELECT name FROM sqlite_master WHERE type='table';")
             tables = [row[0] for row in cursor.fetchall()]
-            
+
             if not tables:
                 self.logger.warning("Database exists but has no tables")
-                conn.close()
                 return False
-            
-            # Check if we have data in key tables
+
+            # Check if we have data in key tables with one combined query
+            # instead of one COUNT(*) round trip per table
             has_data = False
-            for table in ['players', 'sessions', 'matches']:
-                if table in tables:
-                    cursor = conn.execute(f"SELECT COUNT(*) FROM {table}")
-                    count = cursor.fetchone()[0]
+            key_tables = [t for t in ['players', 'sessions', 'matches'] if t in tables]
+            if key_tables:
+                counts_sql = "SELECT " + ", ".join(
+                    f"(SELECT COUNT(*) FROM {table})" for table in key_tables
+                )
+                counts = conn.execute(counts_sql).fetchone()
+                for table, count in zip(key_tables, counts):
                     if count > 0:
                         has_data = True
                         self.logger.info(f"Table {table} has {count} records")
             
-            conn.close()
-            
             if not has_data:
                 self.logger.warning("Database exists but appears to be empty")
                 return False
@@ -239,19 +519,18 @@ class DeploymentSafety:
             
             if location_info['exists']:
                 try:
-                    files = os.listdir(location)
-                    backup_files = [f for f in files if f.endswith('.db') and 'backup' in f]
-                    location_info['backup_count'] = len(backup_files)
-                    
+                    # One scandir pass: DirEntry caches the stat result, so
+                    # each file costs one syscall instead of three
                     total_size = 0
-                    for file in backup_files:
-                        file_path = os.path.join(location, file)
-                        if os.path.exists(file_path):
-                            total_size += os.path.getsize(file_path)
-                    
+                    with os.scandir(location) as entries:
+                        for entry in entries:
+                            if entry.name.endswith(('.db', '.db.zst')) and 'backup' in entry.name:
+                                location_info['backup_count'] += 1
+                                total_size += entry.stat().st_size
+
                     location_info['total_size_mb'] = round(total_size / (1024 * 1024), 2)
                     status['total_backups'] += location_info['backup_count']
-                    
+
                 except Exception as e:
                     location_info['error'] = str(e)
             
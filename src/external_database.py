@@ -10,10 +10,19 @@ class ExternalDatabaseManager:
         self.db_type = os.getenv('DB_TYPE', 'cloud_sqlite')
         self.database_url = os.getenv('DATABASE_URL', None)
         self.connection_string = os.getenv('DB_CONNECTION_STRING', None)
-        
+
+        # The URI is a pure function of the environment, so resolve it
+        # once instead of re-running env lookups and logging per call
+        self._uri = self._resolve_database_uri()
+        self._engine = None
+
     def get_database_uri(self):
         """Get the appropriate database URI based on environment"""
-        
+        return self._uri
+
+    def _resolve_database_uri(self):
+        """Resolve the database URI from the environment (called once)"""
+
         # Check for DB_CONNECTION_STRING first (our preferred method)
         if self.connection_string:
             self.logger.info(f"Using DB_CONNECTION_STRING: {self.connection_string[:20]}...")
@@ -121,9 +130,15 @@ class ExternalDatabaseManager:
         }
     
     def get_engine(self):
-        """Get SQLAlchemy engine for the database"""
-        from sqlalchemy import create_engine
-        
-        uri = self.get_database_uri()
-        return create_engine(uri)
+        """Get SQLAlchemy engine for the database (cached per manager)"""
+        if self._engine is None:
+            from sqlalchemy import create_engine
+
+            uri = self.get_database_uri()
+            # One pooled connection reused across probes; pre_ping drops
+            # stale connections and recycle guards against server-side
+            # idle timeouts
+            self._engine = create_engine(
+                uri, pool_pre_ping=True, pool_size=1, pool_recycle=1800)
+        return self._engine
 
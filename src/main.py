@@ -3,16 +3,24 @@ import sys
 # DON'T CHANGE THIS LINE - it's needed for deployment
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from flask import Flask, send_from_directory, jsonify
+from flask import Flask, send_from_directory
 from flask_cors import CORS
 from models.squash import init_database
-from routes.squash import squash_bp
+from routes.squash import squash_bp, json_response
 from simple_backup_manager import SimpleBackupManager
 from external_database import ExternalDatabaseManager
 import logging
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import atexit
 
+# Single background worker for backups: requests and startup submit jobs
+# and return immediately instead of blocking for the full backup duration
+_bg = ThreadPoolExecutor(max_workers=1)
+_backup_jobs = {}
+atexit.register(_bg.shutdown, wait=True)
+
 # Create Flask app
 app = Flask(__name__, static_folder='static')
 
@@ -43,14 +51,23 @@ os.makedirs(os.path.dirname(db_path), exist_ok=True)
 backup_manager = SimpleBackupManager(db_path)
 
 # Override database URI with external database
-app.config['SQLALCHEMY_DATABASE_URI'] = external_db.get_database_uri()
+app.config['SQLALCHEMY_DATABASE_URI'] = db_uri
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-print(f"Using external database: {external_db.get_database_uri()}")
+# Explicit pool sizing so concurrent requests don't queue on the default
+# five connections; pre-ping drops stale connections before use
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 10,
+    'max_overflow': 20,
+    'pool_pre_ping': True
+}
+
+print(f"Using external database: {db_uri}")
 
 # Store managers in app config for access in routes
 app.config['EXTERNAL_DB'] = external_db
 app.config['BACKUP_MANAGER'] = backup_manager
+app.config['DB_PATH'] = db_path
 
 # Register squash tracker blueprint
 app.register_blueprint(squash_bp)
@@ -73,9 +90,9 @@ def get_database_status():
         db_uri = external_db.get_database_uri()
         db_info = external_db.get_database_info()
         
-        # For SQLite, get file info
+        # For SQLite, get file info (path resolved once at startup)
         if 'sqlite:///' in db_uri:
-            db_path = db_uri.replace('sqlite:///', '')
+            db_path = app.config['DB_PATH']
             db_exists = os.path.exists(db_path)
             db_size = os.path.getsize(db_path) if db_exists else 0
         else:
@@ -85,8 +102,8 @@ def get_database_status():
         
         # Get backup info
         backups = backup_manager.get_backup_info()
-        
-        return jsonify({
+
+        return json_response({
             'success': True,
             'database': {
                 'type': external_db.db_type,
@@ -105,32 +122,63 @@ def get_database_status():
             }
         })
     except Exception as e:
-        return jsonify({
+        return json_response({
             'success': False,
             'message': f'Error getting database status: {str(e)}'
         }), 500
 
 @app.route('/api/admin/backup/create', methods=['POST'])
 def create_backup():
-    """Create a manual backup"""
+    """Start a manual backup on the background worker"""
     try:
         backup_manager = app.config['BACKUP_MANAGER']
-        backup_info = backup_manager.create_backup()
-        
+        job_id = uuid.uuid4().hex
+        _backup_jobs[job_id] = _bg.submit(backup_manager.create_backup)
+
+        return json_response({
+            'success': True,
+            'job_id': job_id,
+            'message': 'Backup started'
+        }), 202
+    except Exception as e:
+        return json_response({
+            'success': False,
+            'message': f'Error creating backup: {str(e)}'
+        }), 500
+
+@app.route('/api/admin/backup/status/<job_id>', methods=['GET'])
+def get_backup_job_status(job_id):
+    """Poll the status of a background backup job"""
+    future = _backup_jobs.get(job_id)
+    if future is None:
+        return json_response({
+            'success': False,
+            'message': 'Unknown backup job'
+        }), 404
+
+    if not future.done():
+        return json_response({
+            'success': True,
+            'status': 'running'
+        })
+
+    try:
+        backup_info = future.result()
         if backup_info:
-            return jsonify({
+            return json_response({
                 'success': True,
-                'backup': backup_info,
-                'message': 'Backup created successfully'
+                'status': 'completed',
+                'backup': backup_info
             })
-        else:
-            return jsonify({
-                'success': False,
-                'message': 'Failed to create backup'
-            }), 500
+        return json_response({
+            'success': False,
+            'status': 'failed',
+            'message': 'Failed to create backup'
+        }), 500
     except Exception as e:
-        return jsonify({
+        return json_response({
             'success': False,
+            'status': 'failed',
             'message': f'Error creating backup: {str(e)}'
         }), 500
 
@@ -140,14 +188,14 @@ def list_backups():
     try:
         backup_manager = app.config['BACKUP_MANAGER']
         backups = backup_manager.get_backup_info()
-        
-        return jsonify({
+
+        return json_response({
             'success': True,
             'backups': backups,
             'count': len(backups)
         })
     except Exception as e:
-        return jsonify({
+        return json_response({
             'success': False,
             'message': f'Error listing backups: {str(e)}'
         }), 500
@@ -159,12 +207,12 @@ def sync_external_storage():
         external_db = app.config['EXTERNAL_DB']
         success = external_db.sync_with_external_storage()
         
-        return jsonify({
+        return json_response({
             'success': success,
             'message': 'External storage sync completed' if success else 'External storage sync failed'
         })
     except Exception as e:
-        return jsonify({
+        return json_response({
             'success': False,
             'message': f'Error syncing external storage: {str(e)}'
         }), 500
@@ -178,12 +226,12 @@ def serve(path):
     else:
         return send_from_directory(static_folder_path, 'index.html')
 
-# Create a backup on startup
+# Create a backup on startup without delaying the first request
 try:
-    backup_manager.create_backup()
-    print("Startup backup created successfully")
+    _bg.submit(backup_manager.create_backup)
+    print("Startup backup queued")
 except Exception as e:
-    print(f"Failed to create startup backup: {e}")
+    print(f"Failed to queue startup backup: {e}")
 
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000, debug=False)
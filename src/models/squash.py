@@ -1,6 +1,13 @@
+import operator
 from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
-from sqlalchemy import Index
+from sqlalchemy import Index, event
+from sqlalchemy.orm import selectinload
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 db = SQLAlchemy()
 
@@ -41,11 +48,24 @@ class Session(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
-    matches = db.relationship('Match', backref='session', lazy='dynamic', cascade='all, delete-orphan')
-    
+    matches = db.relationship('Match', backref='session', lazy='select', cascade='all, delete-orphan')
+
     def __repr__(self):
         return f'<Session {self.id} on {self.date}>'
-    
+
+    @classmethod
+    def get_with_matches(cls, session_id):
+        """Load a session with its matches and their players in one pass.
+
+        Without the eager load, serializing a session costs one query for
+        the matches plus three per match for player1/player2/winner.
+        """
+        return cls.query.options(
+            selectinload(cls.matches).selectinload(Match.player1),
+            selectinload(cls.matches).selectinload(Match.player2),
+            selectinload(cls.matches).selectinload(Match.winner)
+        ).filter_by(id=session_id).first()
+
     def to_dict(self):
         return {
             'id': self.id,
@@ -54,9 +74,19 @@ class Session(db.Model):
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'notes': self.notes,
             'created_at': self.created_at.isoformat(),
-            'matches': [match.to_dict() for match in self.matches.all()]
+            'matches': [match.to_dict() for match in self.matches]
         }
 
+# Plain scalar fields of Match.to_dict, precompiled to attrgetters once so
+# serializing a match is a single dict comprehension instead of repeated
+# per-field lookups (datetimes, related names and is_completed need
+# formatting and are handled separately)
+_MATCH_FIELDS = tuple((key, operator.attrgetter(key)) for key in (
+    'id', 'session_id', 'player1_id', 'player2_id',
+    'player1_score', 'player2_score', 'winner_id',
+    'player1_elo_before', 'player2_elo_before',
+    'player1_elo_change', 'player2_elo_change'))
+
 class Match(db.Model):
     __tablename__ = 'matches'
     
@@ -79,32 +109,29 @@ class Match(db.Model):
         db.CheckConstraint('player1_id != player2_id', name='different_players'),
         Index('idx_match_session_players', 'session_id', 'player1_id', 'player2_id'),
         Index('idx_match_completed', 'completed_at'),
+        Index('idx_match_winner_completed', 'winner_id', 'completed_at'),
+        Index('idx_match_p1_p2_completed', 'player1_id', 'player2_id', 'completed_at'),
+        Index('idx_match_p2_completed', 'player2_id', 'completed_at'),
     )
     
     def __repr__(self):
         return f'<Match {self.id}: {self.player1_score or "?"}-{self.player2_score or "?"}>'
     
     def to_dict(self):
-        return {
-            'id': self.id,
-            'session_id': self.session_id,
-            'player1_id': self.player1_id,
-            'player2_id': self.player2_id,
-            'player1_score': self.player1_score,
-            'player2_score': self.player2_score,
-            'winner_id': self.winner_id,
-            'player1_elo_before': self.player1_elo_before,
-            'player2_elo_before': self.player2_elo_before,
-            'player1_elo_change': self.player1_elo_change,
-            'player2_elo_change': self.player2_elo_change,
-            'created_at': self.created_at.isoformat(),
-            'completed_at': self.completed_at.isoformat() if self.completed_at else None,
-            'notes': self.notes,
-            'player1_name': self.player1.name if self.player1 else None,
-            'player2_name': self.player2.name if self.player2 else None,
-            'winner_name': self.winner.name if self.winner else None,
-            'is_completed': self.is_completed()
-        }
+        d = {key: getter(self) for key, getter in _MATCH_FIELDS}
+        d['created_at'] = self.created_at.isoformat()
+        d['completed_at'] = self.completed_at.isoformat() if self.completed_at else None
+        d['notes'] = self.notes
+        player1 = self.player1
+        player2 = self.player2
+        winner = self.winner
+        d['player1_name'] = player1.name if player1 else None
+        d['player2_name'] = player2.name if player2 else None
+        d['winner_name'] = winner.name if winner else None
+        # is_completed() inlined: one method call per row adds up in
+        # session listings
+        d['is_completed'] = d['player1_score'] is not None and d['player2_score'] is not None
+        return d
     
     def is_completed(self):
         """Check if match has been completed (has scores)"""
@@ -112,17 +139,32 @@ class Match(db.Model):
     
     def update_scores(self, player1_score, player2_score):
         """Update match scores, determine winner, and calculate ELO changes"""
-        # Store ELO ratings before the match
-        self.player1_elo_before = self.player1.elo_rating
-        self.player2_elo_before = self.player2.elo_rating
-        
+        changes = self.apply_scores(
+            player1_score, player2_score,
+            self.player1.elo_rating, self.player2.elo_rating
+        )
+
+        # Update player ELO ratings
+        self.player1.elo_rating += changes[0]
+        self.player2.elo_rating += changes[1]
+
+    def apply_scores(self, player1_score, player2_score, elo_before1, elo_before2):
+        """Set scores, winner, completion time and ELO bookkeeping from
+        explicit before-ratings.
+
+        Returns (player1_elo_change, player2_elo_change) without touching
+        the Player rows, so callers can apply the rating updates in bulk.
+        """
+        self.player1_elo_before = elo_before1
+        self.player2_elo_before = elo_before2
+
         # Update scores
         self.player1_score = player1_score
         self.player2_score = player2_score
-        
+
         # Set completion timestamp
         self.completed_at = datetime.utcnow()
-        
+
         # Determine winner
         if player1_score > player2_score:
             self.winner_id = self.player1_id
@@ -130,21 +172,19 @@ class Match(db.Model):
             self.winner_id = self.player2_id
         else:
             self.winner_id = None  # Tie
-        
+
         # Calculate ELO changes based on points scored
         elo_changes = self.calculate_elo_changes(
-            self.player1_elo_before, 
-            self.player2_elo_before, 
-            player1_score, 
+            elo_before1,
+            elo_before2,
+            player1_score,
             player2_score
         )
-        
+
         self.player1_elo_change = elo_changes[0]
         self.player2_elo_change = elo_changes[1]
-        
-        # Update player ELO ratings
-        self.player1.elo_rating += self.player1_elo_change
-        self.player2.elo_rating += self.player2_elo_change
+
+        return elo_changes
     
     @staticmethod
     def calculate_elo_changes(elo1, elo2, score1, score2):
@@ -189,20 +229,110 @@ class Match(db.Model):
         
         return (change1, change2)
 
+    @staticmethod
+    def calculate_elo_changes_batch(elo1, elo2, score1, score2):
+        """
+        Vectorized calculate_elo_changes for bulk rating recompute
+        (e.g. replaying history after a restore or import)
+
+        Args:
+            elo1, elo2: Sequences of ELO ratings before each match
+            score1, score2: Sequences of points scored in each match
+
+        Returns:
+            tuple: (player1_elo_changes, player2_elo_changes) as lists,
+                   matching the scalar version element for element
+        """
+        if np is None:
+            # NumPy is optional; fall back to the scalar kernel
+            changes = [Match.calculate_elo_changes(e1, e2, s1, s2)
+                       for e1, e2, s1, s2 in zip(elo1, elo2, score1, score2)]
+            return ([c[0] for c in changes], [c[1] for c in changes])
+
+        e1 = np.asarray(elo1, dtype=np.float64)
+        e2 = np.asarray(elo2, dtype=np.float64)
+        s1 = np.asarray(score1, dtype=np.float64)
+        s2 = np.asarray(score2, dtype=np.float64)
+
+        K = 32
+
+        expected1 = 1 / (1 + np.power(10, (e2 - e1) / 400))
+        expected2 = 1 - expected1
+
+        total = s1 + s2
+        actual1 = np.where(total == 0, 0.5, s1 / np.maximum(total, 1))
+        actual2 = np.where(total == 0, 0.5, s2 / np.maximum(total, 1))
+
+        point_diff = np.abs(s1 - s2)
+        max_diff = np.maximum(s1, s2)
+        diff_multiplier = np.where(max_diff == 0, 1.0,
+                                   0.5 + point_diff / np.maximum(max_diff, 1))
+
+        # int() truncates toward zero, which np.trunc matches (astype on
+        # its own would too, but only for the positive half)
+        change1 = np.trunc(K * diff_multiplier * (actual1 - expected1)).astype(np.int64)
+        change2 = np.trunc(K * diff_multiplier * (actual2 - expected2)).astype(np.int64)
+
+        return (change1.tolist(), change2.tolist())
+
+def _apply_sqlite_pragmas(dbapi_conn, connection_record):
+    """Tune every new SQLite connection the app opens.
+
+    WAL lets backup reads proceed while the app writes (and halves write
+    fsyncs together with synchronous=NORMAL); journal mode persists in
+    the file, but the cache, temp_store, mmap and busy_timeout settings
+    are per-connection, hence the connect-event hook.
+    """
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
 def init_database(app):
     """Initialize database with default data"""
     db.init_app(app)
     with app.app_context():
+        # Register before create_all so every pooled connection,
+        # including the first, comes up tuned
+        if db.engine.dialect.name == 'sqlite':
+            event.listen(db.engine, 'connect', _apply_sqlite_pragmas)
+
         db.create_all()
-        
-        # Create default players if they don't exist
+
+        # create_all only builds indexes for new tables; make sure
+        # databases created before these indexes existed pick them up,
+        # then refresh planner statistics so they actually get used
+        try:
+            db.session.execute(db.text(
+                'CREATE INDEX IF NOT EXISTS idx_match_winner_completed '
+                'ON matches (winner_id, completed_at)'))
+            db.session.execute(db.text(
+                'CREATE INDEX IF NOT EXISTS idx_match_p1_p2_completed '
+                'ON matches (player1_id, player2_id, completed_at)'))
+            db.session.execute(db.text(
+                'CREATE INDEX IF NOT EXISTS idx_match_p2_completed '
+                'ON matches (player2_id, completed_at)'))
+            db.session.execute(db.text('ANALYZE'))
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            print(f"Error ensuring match indexes: {e}")
+
+
+        # Create default players if they don't exist: one SELECT for the
+        # whole list and one multi-row INSERT for the missing names,
+        # instead of a SELECT + INSERT per player
         default_players = ['Miklas', 'Morten', 'Patrick', 'Jens']
-        for player_name in default_players:
-            existing_player = Player.query.filter_by(name=player_name).first()
-            if not existing_player:
-                player = Player(name=player_name)
-                db.session.add(player)
-        
+        existing = {row[0] for row in db.session.execute(
+            db.select(Player.name).where(Player.name.in_(default_players)))}
+        missing = [name for name in default_players if name not in existing]
+        if missing:
+            db.session.execute(db.insert(Player), [{'name': name} for name in missing])
+
         try:
             db.session.commit()
         except Exception as e:
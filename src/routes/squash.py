@@ -1,41 +1,94 @@
+import functools
+import json
+import threading
+import time
 from datetime import datetime
-from flask import Blueprint, request, jsonify
-from sqlalchemy.exc import SQLAlchemyError
+from flask import Blueprint, Response, abort, request
+from sqlalchemy import case, func, text, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import selectinload
 from models.squash import db, Player, Session, Match
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 squash_bp = Blueprint('squash', __name__, url_prefix='/api')
 
-def validate_json_request():
-    """Decorator to validate JSON request"""
-    def decorator(f):
-        def wrapper(*args, **kwargs):
-            if request.content_type != 'application/json':
-                return jsonify({'error': 'Content-Type must be application/json'}), 400
-            try:
-                data = request.get_json()
-                if data is None:
-                    data = {}
-                return f(*args, data=data, **kwargs)
-            except Exception as e:
-                return jsonify({'error': 'Invalid JSON'}), 400
-        wrapper.__name__ = f.__name__
-        return wrapper
-    return decorator
+def json_response(payload, status=200):
+    """Build a JSON response through orjson's C encoder when available.
+
+    orjson formats datetime/date values natively, so bulk payloads skip
+    the per-field isoformat work and Flask's jsonify overhead; stdlib
+    json with default=str is the fallback.
+    """
+    if orjson is not None:
+        body = orjson.dumps(
+            payload,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY,
+            default=str)
+    else:
+        body = json.dumps(payload, default=str)
+    return Response(body, status=status, mimetype='application/json')
+
+# Tiny in-process TTL cache for the read-heavy poll endpoints
+# (leaderboard/highlights). Entries expire after 30s and every write that
+# can change match or player state clears the cache outright, so polling
+# clients mostly hit memory instead of rebuilding the aggregation.
+_VIEW_CACHE_TTL = 30
+_view_cache = {}
+
+def _view_cache_get(key):
+    hit = _view_cache.get(key)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    return None
+
+def _view_cache_set(key, payload):
+    _view_cache[key] = (time.monotonic() + _VIEW_CACHE_TTL, payload)
+
+def _view_cache_clear():
+    _view_cache.clear()
+
+def require_json(f):
+    """Decorator passing the parsed JSON body to the handler as data.
+
+    request.is_json matches the mimetype properly (charset parameters
+    included) and get_json caches the parsed body, so nothing is parsed
+    twice; the old factory indirection added two call frames per request
+    for no configuration.
+    """
+    @functools.wraps(f)
+    def wrapper(*args, **kwargs):
+        if not request.is_json:
+            return json_response({'error': 'Content-Type must be application/json'}), 400
+        data = request.get_json(silent=True, cache=True)
+        if data is None:
+            # silent=True also swallows parse errors; a non-empty body
+            # that failed to parse is a client bug, not an empty payload
+            if request.data:
+                return json_response({'error': 'Invalid JSON'}), 400
+            data = {}
+        return f(*args, data=data, **kwargs)
+    return wrapper
 
 # Health check endpoint
 @squash_bp.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint"""
     try:
-        # Test database connection
-        db.session.execute('SELECT 1')
-        return jsonify({
+        # Ping on a raw pooled connection instead of building up a full
+        # ORM session, and release it before serializing the response
+        with db.engine.connect() as conn:
+            conn.execute(text('SELECT 1'))
+        return json_response({
             'status': 'healthy',
             'database': 'connected',
             'timestamp': datetime.utcnow().isoformat()
         })
     except Exception as e:
-        return jsonify({
+        return json_response({
             'status': 'unhealthy',
             'database': 'disconnected',
             'error': str(e),
@@ -47,77 +100,133 @@ def health_check():
 def get_players():
     """Get all active players"""
     try:
-        players = Player.query.filter_by(active=True).all()
-        return jsonify([player.to_dict() for player in players])
+        # Core column select: no ORM objects are hydrated just to be
+        # flattened into dicts again (orjson formats created_at natively)
+        rows = db.session.execute(
+            db.select(Player.id, Player.name, Player.elo_rating,
+                      Player.active, Player.created_at)
+            .where(Player.active == True)
+        ).all()
+        return json_response([
+            {'id': row.id,
+             'name': row.name,
+             'elo_rating': row.elo_rating,
+             'active': row.active,
+             'created_at': row.created_at}
+            for row in rows
+        ])
     except SQLAlchemyError as e:
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
 @squash_bp.route('/players', methods=['POST'])
-@validate_json_request()
+@require_json
 def create_player(data):
     """Create a new player"""
     try:
         name = data.get('name', '').strip()
         if not name:
-            return jsonify({'error': 'Player name is required'}), 400
-        
-        # Check if player already exists
-        existing_player = Player.query.filter_by(name=name).first()
-        if existing_player:
-            return jsonify({'error': 'Player with this name already exists'}), 400
+            return json_response({'error': 'Player name is required'}), 400
         
+        # The unique constraint on Player.name handles duplicates: rely on
+        # IntegrityError instead of a racy pre-SELECT
         player = Player(name=name)
         db.session.add(player)
         db.session.commit()
-        
-        return jsonify(player.to_dict()), 201
+
+        return json_response(player.to_dict()), 201
+    except IntegrityError:
+        db.session.rollback()
+        return json_response({'error': 'Player with this name already exists'}), 400
     except SQLAlchemyError as e:
         db.session.rollback()
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
 @squash_bp.route('/players/<int:player_id>', methods=['DELETE'])
 def delete_player(player_id):
     """Soft delete a player (mark as inactive)"""
     try:
-        player = Player.query.get_or_404(player_id)
+        player = db.session.get(Player, player_id)
+        if player is None:
+            abort(404)
         player.active = False
         db.session.commit()
-        return jsonify({'message': 'Player deleted successfully'})
+        _view_cache_clear()
+        return json_response({'message': 'Player deleted successfully'})
     except SQLAlchemyError as e:
         db.session.rollback()
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
 # Session endpoints
 @squash_bp.route('/sessions', methods=['GET'])
 def get_sessions():
-    """Get all sessions with their matches"""
+    """Get sessions with their matches, optionally keyset-paginated.
+
+    Without parameters the full list comes back as a bare array (what the
+    frontend consumes). With ?limit=N (and an optional ?before=<iso>
+    cursor) the response is a page plus a next_cursor to pass back as
+    before; seeking on created_at stays cheap at any depth, unlike
+    OFFSET, which still scans and discards every skipped row.
+    """
     try:
-        sessions = Session.query.order_by(Session.created_at.desc()).all()
-        return jsonify([session.to_dict() for session in sessions])
+        limit = request.args.get('limit', type=int)
+        before = request.args.get('before')
+
+        # Eager-load matches and their players so the listing costs a
+        # handful of queries instead of one per session plus three per match
+        query = Session.query.options(
+            selectinload(Session.matches).selectinload(Match.player1),
+            selectinload(Session.matches).selectinload(Match.player2),
+            selectinload(Session.matches).selectinload(Match.winner)
+        ).order_by(Session.created_at.desc())
+
+        if before:
+            try:
+                cursor = datetime.fromisoformat(before)
+            except ValueError:
+                return json_response({'error': 'Invalid before cursor'}), 400
+            query = query.filter(Session.created_at < cursor)
+
+        if limit is None:
+            return json_response([session.to_dict() for session in query.all()])
+
+        if limit <= 0:
+            return json_response({'error': 'limit must be positive'}), 400
+
+        sessions = query.limit(limit).all()
+        next_cursor = None
+        if len(sessions) == limit:
+            next_cursor = sessions[-1].created_at.isoformat()
+        return json_response({
+            'sessions': [session.to_dict() for session in sessions],
+            'next_cursor': next_cursor
+        })
     except SQLAlchemyError as e:
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
 @squash_bp.route('/sessions', methods=['POST'])
-@validate_json_request()
+@require_json
 def create_session(data):
     """Create a new session with matches"""
     try:
         print(f"DEBUG: Received session creation request with data: {data}")
         
-        player_ids = data.get('player_ids', [])
+        # Dedup up front so a repeated id can't produce a player-vs-self match
+        player_ids = list(dict.fromkeys(data.get('player_ids', [])))
         print(f"DEBUG: Extracted player_ids: {player_ids}")
-        
+
         if len(player_ids) < 2:
             print(f"DEBUG: Not enough players: {len(player_ids)}")
-            return jsonify({'error': 'At least 2 players are required'}), 400
-        
-        # Validate all players exist
-        players = Player.query.filter(Player.id.in_(player_ids)).all()
-        print(f"DEBUG: Found {len(players)} players in database for IDs {player_ids}")
-        
-        if len(players) != len(player_ids):
-            print(f"DEBUG: Player count mismatch. Expected: {len(player_ids)}, Found: {len(players)}")
-            return jsonify({'error': 'One or more players not found'}), 404
+            return json_response({'error': 'At least 2 players are required'}), 400
+
+        # Validate all players exist with a single COUNT instead of
+        # hydrating every Player row just to measure the list
+        found = db.session.query(func.count(Player.id)).filter(
+            Player.id.in_(player_ids)).scalar()
+        print(f"DEBUG: Found {found} players in database for IDs {player_ids}")
+
+        if found != len(player_ids):
+            print(f"DEBUG: Player count mismatch. Expected: {len(player_ids)}, Found: {found}")
+            return json_response({'error': 'One or more players not found'}), 404
         
         # Create session
         session = Session()
@@ -125,70 +234,91 @@ def create_session(data):
         db.session.flush()  # Get session ID
         print(f"DEBUG: Created session with ID: {session.id}")
         
-        # Create matches for all player combinations
-        matches_created = 0
-        for i in range(len(player_ids)):
-            for j in range(i + 1, len(player_ids)):
-                match = Match(
-                    session_id=session.id,
-                    player1_id=player_ids[i],
-                    player2_id=player_ids[j]
-                )
-                db.session.add(match)
-                matches_created += 1
-                print(f"DEBUG: Created match {matches_created}: Player {player_ids[i]} vs Player {player_ids[j]}")
-        
+        # Create matches for all player combinations with one multi-row
+        # INSERT instead of an ORM add/INSERT per pair
+        rows = [
+            {'session_id': session.id,
+             'player1_id': player_ids[i],
+             'player2_id': player_ids[j]}
+            for i in range(len(player_ids))
+            for j in range(i + 1, len(player_ids))
+        ]
+        db.session.execute(Match.__table__.insert(), rows)
+        matches_created = len(rows)
+
         db.session.commit()
         print(f"DEBUG: Successfully committed session with {matches_created} matches")
         
-        # Return session with matches
-        session = Session.query.get(session.id)
+        # Return session with matches (eager-loaded to avoid per-match queries)
+        session = Session.get_with_matches(session.id)
         result = session.to_dict()
         print(f"DEBUG: Returning session data: {result}")
-        return jsonify(result)
+        return json_response(result)
         
     except SQLAlchemyError as e:
         db.session.rollback()
         print(f"DEBUG: SQLAlchemy error: {str(e)}")
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
     except Exception as e:
         db.session.rollback()
         print(f"DEBUG: Unexpected error: {str(e)}")
-        return jsonify({'error': f'Unexpected error: {str(e)}'}), 500
+        return json_response({'error': f'Unexpected error: {str(e)}'}), 500
+
+@squash_bp.route('/sessions/<int:session_id>', methods=['GET'])
+def get_session(session_id):
+    """Get a single session with its matches"""
+    try:
+        session = Session.get_with_matches(session_id)
+        if session is None:
+            return json_response({'error': 'Session not found'}), 404
+        return json_response(session.to_dict())
+    except SQLAlchemyError as e:
+        return json_response({'error': 'Database error occurred'}), 500
 
 @squash_bp.route('/sessions/<int:session_id>', methods=['DELETE'])
 def delete_session(session_id):
     """Delete a session and all its matches"""
     try:
-        session = Session.query.get_or_404(session_id)
-        
-        # First, revert ELO changes for all completed matches in this session
-        completed_matches = Match.query.filter_by(session_id=session_id).filter(
-            Match.player1_score.isnot(None),
-            Match.player2_score.isnot(None)
-        ).all()
-        
-        for match in completed_matches:
-            if match.player1_elo_change is not None:
-                match.player1.elo_rating -= match.player1_elo_change
-            if match.player2_elo_change is not None:
-                match.player2.elo_rating -= match.player2_elo_change
+        session = db.session.get(Session, session_id)
+        if session is None:
+            abort(404)
+        
+        # First, revert ELO changes for all completed matches in this
+        # session: one UPDATE per side subtracting the summed change per
+        # player, instead of loading every match/player and emitting an
+        # UPDATE per touched row at flush
+        for pid_col, delta_col in ((Match.player1_id, Match.player1_elo_change),
+                                   (Match.player2_id, Match.player2_elo_change)):
+            deltas = db.session.query(
+                pid_col.label('pid'),
+                func.sum(delta_col).label('delta')
+            ).filter(
+                Match.session_id == session_id,
+                delta_col.isnot(None)
+            ).group_by(pid_col).subquery()
+
+            db.session.execute(
+                update(Player).where(Player.id == deltas.c.pid).values(
+                    elo_rating=Player.elo_rating - deltas.c.delta)
+            )
         
-        # Delete all matches in the session
-        Match.query.filter_by(session_id=session_id).delete()
+        # Delete all matches in the session; skip the identity-map sync
+        # since the session object is deleted right after
+        Match.query.filter_by(session_id=session_id).delete(synchronize_session=False)
         
         # Delete the session
         db.session.delete(session)
         db.session.commit()
-        
-        return jsonify({'message': 'Session and all matches deleted successfully'})
+        _view_cache_clear()
+
+        return json_response({'message': 'Session and all matches deleted successfully'})
     except SQLAlchemyError as e:
         db.session.rollback()
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
 # Match endpoints
 @squash_bp.route('/matches', methods=['POST'])
-@validate_json_request()
+@require_json
 def create_match(data):
     """Create a new match"""
     try:
@@ -201,21 +331,21 @@ def create_match(data):
         
         # Validate required fields
         if not session_id or not player1_id or not player2_id:
-            return jsonify({'error': 'session_id, player1_id, and player2_id are required'}), 400
+            return json_response({'error': 'session_id, player1_id, and player2_id are required'}), 400
         
         if player1_id == player2_id:
-            return jsonify({'error': 'Players must be different'}), 400
+            return json_response({'error': 'Players must be different'}), 400
         
         # Validate players exist
-        player1 = Player.query.get(player1_id)
-        player2 = Player.query.get(player2_id)
+        player1 = db.session.get(Player, player1_id)
+        player2 = db.session.get(Player, player2_id)
         if not player1 or not player2:
-            return jsonify({'error': 'One or both players not found'}), 404
+            return json_response({'error': 'One or both players not found'}), 404
         
         # Validate session exists
-        session = Session.query.get(session_id)
+        session = db.session.get(Session, session_id)
         if not session:
-            return jsonify({'error': 'Session not found'}), 404
+            return json_response({'error': 'Session not found'}), 404
         
         match = Match(
             session_id=session_id,
@@ -232,7 +362,8 @@ def create_match(data):
         
         db.session.add(match)
         db.session.commit()
-        
+        _view_cache_clear()
+
         # Prepare response with ELO changes if match is completed
         response_data = match.to_dict()
         if match.player1_elo_change is not None and match.player2_elo_change is not None:
@@ -251,54 +382,79 @@ def create_match(data):
                 }
             }
         
-        return jsonify(response_data), 201
+        return json_response(response_data), 201
     except SQLAlchemyError as e:
         db.session.rollback()
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
 @squash_bp.route('/matches/<int:match_id>', methods=['PUT'])
-@validate_json_request()
+@require_json
 def update_match(match_id, data):
     """Update match scores and information"""
     try:
-        match = Match.query.get_or_404(match_id)
-        
-        # Store original ELO ratings before update
-        original_player1_elo = match.player1.elo_rating
-        original_player2_elo = match.player2.elo_rating
-        
-        # If match was already completed, revert previous ELO changes
-        if match.is_completed() and match.player1_elo_change is not None and match.player2_elo_change is not None:
-            match.player1.elo_rating -= match.player1_elo_change
-            match.player2.elo_rating -= match.player2_elo_change
-        
+        match = db.session.get(Match, match_id)
+        if match is None:
+            abort(404)
+
         # Update scores if provided
         if 'player1_score' in data and 'player2_score' in data:
             player1_score = data['player1_score']
             player2_score = data['player2_score']
-            
+
             # Validate scores are integers
             if not isinstance(player1_score, int) or not isinstance(player2_score, int):
-                return jsonify({'error': 'Scores must be integers'}), 400
-            
+                return json_response({'error': 'Scores must be integers'}), 400
+
             # Validate score ranges
             if player1_score < 0 or player2_score < 0:
-                return jsonify({'error': 'Scores cannot be negative'}), 400
-            
-            match.update_scores(player1_score, player2_score)
+                return json_response({'error': 'Scores cannot be negative'}), 400
+
+            # Previously applied ELO changes, zero on first completion;
+            # reverting and reapplying collapses into one net delta so each
+            # player gets a single UPDATE and no revert-only flush (which
+            # also used to corrupt ratings on a notes-only update)
+            if (match.is_completed() and match.player1_elo_change is not None
+                    and match.player2_elo_change is not None):
+                prev1, prev2 = match.player1_elo_change, match.player2_elo_change
+            else:
+                prev1 = prev2 = 0
+
+            # Current stored ratings via a column select, no Player
+            # entities hydrated just to do rating arithmetic
+            ratings = dict(db.session.query(Player.id, Player.elo_rating).filter(
+                Player.id.in_((match.player1_id, match.player2_id))).all())
+
+            new1, new2 = match.apply_scores(
+                player1_score, player2_score,
+                ratings[match.player1_id] - prev1,
+                ratings[match.player2_id] - prev2)
+
+            for pid, delta in ((match.player1_id, new1 - prev1),
+                               (match.player2_id, new2 - prev2)):
+                if delta:
+                    db.session.execute(
+                        update(Player).where(Player.id == pid).values(
+                            elo_rating=Player.elo_rating + delta))
         
         # Update notes if provided
         if 'notes' in data:
             match.notes = data['notes'].strip() if data['notes'] else None
         
         db.session.commit()
-        
+        _view_cache_clear()
+
         # Trigger backup after match completion (if backup scheduler is available)
         try:
             from flask import current_app
             backup_scheduler = current_app.config.get('BACKUP_SCHEDULER')
             if backup_scheduler:
-                backup_scheduler.trigger_match_backup()
+                # Run the backup I/O off the request thread; the
+                # scheduler's match counter already coalesces bursts into
+                # one milestone backup
+                threading.Thread(
+                    target=backup_scheduler.trigger_match_backup,
+                    daemon=True
+                ).start()
         except Exception as e:
             # Don't fail the request if backup fails
             print(f"Warning: Failed to trigger backup after match update: {e}")
@@ -323,17 +479,19 @@ def update_match(match_id, data):
                 }
             }
         
-        return jsonify(response_data)
+        return json_response(response_data)
         
     except SQLAlchemyError as e:
         db.session.rollback()
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
 @squash_bp.route('/matches/<int:match_id>', methods=['DELETE'])
 def delete_match(match_id):
     """Delete a match and revert ELO changes"""
     try:
-        match = Match.query.get_or_404(match_id)
+        match = db.session.get(Match, match_id)
+        if match is None:
+            abort(404)
         
         # Revert ELO changes if match was completed
         if match.is_completed() and match.player1_elo_change is not None and match.player2_elo_change is not None:
@@ -342,32 +500,58 @@ def delete_match(match_id):
         
         db.session.delete(match)
         db.session.commit()
-        return jsonify({'message': 'Match deleted successfully'})
+        _view_cache_clear()
+        return json_response({'message': 'Match deleted successfully'})
     except SQLAlchemyError as e:
         db.session.rollback()
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
 # Leaderboard endpoint
 @squash_bp.route('/leaderboard', methods=['GET'])
 def get_leaderboard():
     """Get player leaderboard with ELO ratings"""
     try:
-        players = Player.query.filter_by(active=True).all()
+        cached = _view_cache_get('leaderboard')
+        if cached is not None:
+            return json_response(cached)
+
+        # One aggregation instead of a match query per player: each
+        # completed match contributes a (player_id, win) row per side via
+        # UNION ALL, grouped once and outer-joined to the active players
+        completed = (Match.player1_score.isnot(None),
+                     Match.player2_score.isnot(None))
+        p1_side = db.session.query(
+            Match.player1_id.label('pid'),
+            case((Match.winner_id == Match.player1_id, 1), else_=0).label('win')
+        ).filter(*completed)
+        p2_side = db.session.query(
+            Match.player2_id.label('pid'),
+            case((Match.winner_id == Match.player2_id, 1), else_=0).label('win')
+        ).filter(*completed)
+        per_side = p1_side.union_all(p2_side).subquery()
+
+        aggregated = db.session.query(
+            per_side.c.pid.label('pid'),
+            func.count().label('total'),
+            func.sum(per_side.c.win).label('wins')
+        ).group_by(per_side.c.pid).subquery()
+
+        # Project only the columns the payload needs; no Player entities
+        # are hydrated for this read-only listing
+        rows = db.session.query(
+            Player.id, Player.name, Player.elo_rating,
+            aggregated.c.total, aggregated.c.wins
+        ).outerjoin(
+            aggregated, Player.id == aggregated.c.pid
+        ).filter(Player.active == True).all()
+
         leaderboard = []
-        
-        for player in players:
-            # Get all matches for this player
-            all_matches = Match.query.filter(
-                (Match.player1_id == player.id) | (Match.player2_id == player.id),
-                Match.player1_score.isnot(None),
-                Match.player2_score.isnot(None)
-            ).all()
-            
-            if not all_matches:
+        for player_id, player_name, elo_rating, total_matches, wins in rows:
+            # Players with no completed matches stay off the board
+            if not total_matches:
                 continue
-            
-            total_matches = len(all_matches)
-            wins = len([m for m in all_matches if m.winner_id == player.id])
+
+            wins = int(wins)
             losses = total_matches - wins
             win_rate = wins / total_matches if total_matches > 0 else 0
             
@@ -376,9 +560,9 @@ def get_leaderboard():
             points_per_match = total_points / total_matches if total_matches > 0 else 0
             
             leaderboard.append({
-                'id': player.id,
-                'name': player.name,
-                'elo_rating': player.elo_rating,
+                'id': player_id,
+                'name': player_name,
+                'elo_rating': elo_rating,
                 'matches_played': total_matches,
                 'wins': wins,
                 'losses': losses,
@@ -389,10 +573,11 @@ def get_leaderboard():
         
         # Sort by ELO rating (descending), then by points per match
         leaderboard.sort(key=lambda x: (x['elo_rating'], x['points_per_match']), reverse=True)
-        
-        return jsonify(leaderboard)
+
+        _view_cache_set('leaderboard', leaderboard)
+        return json_response(leaderboard)
     except SQLAlchemyError as e:
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
 
 # Highlight stats endpoint
@@ -400,8 +585,17 @@ def get_leaderboard():
 def get_highlights():
     """Get highlight stats from recent sessions with ELO changes"""
     try:
-        # Get the most recent completed matches (last 10)
-        recent_matches = Match.query.filter(
+        cached = _view_cache_get('highlights')
+        if cached is not None:
+            return json_response(cached)
+
+        # Get the most recent completed matches (last 10), with the
+        # players each highlight reads loaded up front
+        recent_matches = Match.query.options(
+            selectinload(Match.player1),
+            selectinload(Match.player2),
+            selectinload(Match.winner)
+        ).filter(
             Match.player1_score.isnot(None),
             Match.player2_score.isnot(None),
             Match.completed_at.isnot(None)
@@ -434,50 +628,54 @@ def get_highlights():
             Match.player2_score.isnot(None)
         ).count()
         
-        # Get biggest ELO gains/losses from recent matches
-        biggest_gain = None
-        biggest_loss = None
-        
-        for match in recent_matches:
-            if match.player1_elo_change and match.player2_elo_change:
-                if biggest_gain is None or match.player1_elo_change > biggest_gain['elo_change']:
-                    biggest_gain = {
-                        'player_name': match.player1.name,
-                        'elo_change': match.player1_elo_change,
-                        'opponent': match.player2.name,
-                        'score': f"{match.player1_score}-{match.player2_score}"
-                    }
-                if biggest_gain is None or match.player2_elo_change > biggest_gain['elo_change']:
-                    biggest_gain = {
-                        'player_name': match.player2.name,
-                        'elo_change': match.player2_elo_change,
-                        'opponent': match.player1.name,
-                        'score': f"{match.player2_score}-{match.player1_score}"
-                    }
-                
-                if biggest_loss is None or match.player1_elo_change < biggest_loss['elo_change']:
-                    biggest_loss = {
-                        'player_name': match.player1.name,
-                        'elo_change': match.player1_elo_change,
-                        'opponent': match.player2.name,
-                        'score': f"{match.player1_score}-{match.player2_score}"
-                    }
-                if biggest_loss is None or match.player2_elo_change < biggest_loss['elo_change']:
-                    biggest_loss = {
-                        'player_name': match.player2.name,
-                        'elo_change': match.player2_elo_change,
-                        'opponent': match.player1.name,
-                        'score': f"{match.player2_score}-{match.player1_score}"
-                    }
+        # Get biggest ELO gains/losses from the same recent window with
+        # four indexed ORDER BY ... LIMIT 1 seeks instead of the Python
+        # branch ladder (which also treated a 0 change as missing)
+        recent_ids = [match.id for match in recent_matches]
+
+        def extreme(column, largest):
+            order = column.desc() if largest else column.asc()
+            return Match.query.filter(
+                Match.id.in_(recent_ids), column.isnot(None)
+            ).order_by(order).first()
+
+        def entry(match, side):
+            if side == 1:
+                return {
+                    'player_name': match.player1.name,
+                    'elo_change': match.player1_elo_change,
+                    'opponent': match.player2.name,
+                    'score': f"{match.player1_score}-{match.player2_score}"
+                }
+            return {
+                'player_name': match.player2.name,
+                'elo_change': match.player2_elo_change,
+                'opponent': match.player1.name,
+                'score': f"{match.player2_score}-{match.player1_score}"
+            }
+
+        gain_candidates = [entry(m, side) for m, side in (
+            (extreme(Match.player1_elo_change, largest=True), 1),
+            (extreme(Match.player2_elo_change, largest=True), 2)) if m]
+        loss_candidates = [entry(m, side) for m, side in (
+            (extreme(Match.player1_elo_change, largest=False), 1),
+            (extreme(Match.player2_elo_change, largest=False), 2)) if m]
+
+        biggest_gain = max(gain_candidates, key=lambda c: c['elo_change'],
+                           default=None)
+        biggest_loss = min(loss_candidates, key=lambda c: c['elo_change'],
+                           default=None)
         
-        return jsonify({
+        payload = {
             'recent_matches': highlights,
             'stats': {
                 'matches_today': total_matches_today,
                 'biggest_elo_gain': biggest_gain,
                 'biggest_elo_loss': biggest_loss
             }
-        })
+        }
+        _view_cache_set('highlights', payload)
+        return json_response(payload)
     except SQLAlchemyError as e:
-        return jsonify({'error': 'Database error occurred'}), 500
+        return json_response({'error': 'Database error occurred'}), 500
 
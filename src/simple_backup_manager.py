@@ -1,11 +1,15 @@
 import os
-import shutil
+import sqlite3
 import logging
 from datetime import datetime
 
 class SimpleBackupManager:
     """Simplified backup manager for external database"""
-    
+
+    # A backup lands after every 10 matches plus each startup, so 48 keeps
+    # days of history while stopping the directory from growing forever
+    MAX_KEEP = 48
+
     def __init__(self, db_path):
         self.db_path = db_path
         self.backup_dir = '/tmp/external_squash_data/backups'
@@ -25,8 +29,20 @@ class SimpleBackupManager:
             backup_filename = f"squash_backup_{timestamp}.db"
             backup_path = os.path.join(self.backup_dir, backup_filename)
             
-            shutil.copy2(self.db_path, backup_path)
-            
+            # SQLite's online backup API copies pages atomically through
+            # the VFS, so a concurrent writer can't tear a page the way a
+            # raw file copy against a live database can
+            src = sqlite3.connect(self.db_path)
+            try:
+                dst = sqlite3.connect(backup_path)
+                try:
+                    src.backup(dst, pages=1000, sleep=0.05)
+                finally:
+                    dst.close()
+            finally:
+                src.close()
+
+
             backup_info = {
                 'filename': backup_filename,
                 'path': backup_path,
@@ -36,12 +52,31 @@ class SimpleBackupManager:
             }
             
             self.logger.info(f"Backup created: {backup_path}")
+            self._prune_old_backups()
             return backup_info
-            
+
         except Exception as e:
             self.logger.error(f"Failed to create backup: {e}")
             return None
-    
+
+    def _prune_old_backups(self):
+        """Drop the oldest backups beyond MAX_KEEP"""
+        try:
+            with os.scandir(self.backup_dir) as entries:
+                backups = [entry for entry in entries
+                           if entry.name.endswith('.db') and 'backup' in entry.name
+                           and entry.is_file()]
+
+            # Filenames embed the timestamp, so a reverse name sort is
+            # newest-first without any stat calls
+            backups.sort(key=lambda entry: entry.name, reverse=True)
+            for entry in backups[self.MAX_KEEP:]:
+                os.unlink(entry.path)
+                self.logger.debug(f"Pruned old backup: {entry.name}")
+
+        except Exception as e:
+            self.logger.error(f"Error pruning old backups: {e}")
+
     def get_backup_info(self):
         """Get information about existing backups"""
         try:
@@ -49,21 +84,25 @@ class SimpleBackupManager:
                 return []
             
             backups = []
-            for filename in os.listdir(self.backup_dir):
-                if filename.endswith('.db') and 'backup' in filename:
-                    file_path = os.path.join(self.backup_dir, filename)
-                    stat = os.stat(file_path)
-                    
-                    backups.append({
-                        'filename': filename,
-                        'path': file_path,
-                        'size': stat.st_size,
-                        'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                        'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
-                    })
+            # scandir returns entries with the stat result already cached,
+            # so each file costs one syscall instead of two
+            with os.scandir(self.backup_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.db') and 'backup' in entry.name and entry.is_file():
+                        stat = entry.stat()
+
+                        backups.append({
+                            'filename': entry.name,
+                            'path': entry.path,
+                            'size': stat.st_size,
+                            'created': datetime.fromtimestamp(stat.st_ctime).isoformat(),
+                            'modified': datetime.fromtimestamp(stat.st_mtime).isoformat()
+                        })
             
-            # Sort by creation time (newest first)
-            backups.sort(key=lambda x: x['created'], reverse=True)
+            # Sort newest first. The timestamp embedded in the filename
+            # (squash_backup_YYYYMMDD_HHMMSS.db) sorts lexicographically in
+            # chronological order, so no stat-derived key is needed.
+            backups.sort(key=lambda x: x['filename'], reverse=True)
             return backups
             
         except Exception as e:
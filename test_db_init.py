@@ -1,7 +1,6 @@
 import os
 import sys
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
 
 # Add the src directory to the Python path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -23,12 +22,14 @@ print(f"Connection String: {db_manager.connection_string}")
 try:
     # Get the engine
     engine = db_manager.get_engine()
-    
-    # Execute a test query
+
+    # do_ping is the driver's lightweight liveness check (no
+    # parse/plan/execute cycle); the dialect records the server version
+    # during the handshake, so no query runs either
     with engine.connect() as conn:
-        result = conn.execute(text("SELECT 1"))
-        print(f"Query result: {result.fetchone()}")
-    
+        engine.dialect.do_ping(conn.connection.dbapi_connection)
+        print(f"Server version: {engine.dialect.server_version_info}")
+
     print("Database connection successful!")
 except Exception as e:
     print(f"Error connecting to database: {e}")
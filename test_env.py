@@ -1,16 +1,21 @@
-import os
-import sys
-import requests
 import json
+import requests
+from requests.adapters import HTTPAdapter
+
+# One session reuses the TCP+TLS connection across calls (keep-alive),
+# so only the first request pays the handshake; timeouts keep a dead
+# host from hanging the script
+session = requests.Session()
+session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
 # Test the deployed application
 url = "https://j6h5i7c1vpvo.manus.space/api/health"
-response = requests.get(url)
+response = session.get(url, timeout=5)
 print(f"Health check response: {response.status_code}")
 print(response.json())
 
 # Test the database status endpoint
 url = "https://j6h5i7c1vpvo.manus.space/api/admin/database/status"
-response = requests.get(url)
+response = session.get(url, timeout=5)
 print(f"Database status response: {response.status_code}")
 print(json.dumps(response.json(), indent=2))
@@ -10,21 +10,15 @@ db_connection_string = os.getenv('DB_CONNECTION_STRING')
 print(f"Connection string: {db_connection_string}")
 
 try:
-    # Connect to PostgreSQL
-    conn = psycopg2.connect(db_connection_string)
-    
-    # Create a cursor
-    cur = conn.cursor()
-    
-    # Execute a test query
-    cur.execute("SELECT version();")
-    
-    # Get the result
-    version = cur.fetchone()
-    print(f"PostgreSQL version: {version[0]}")
-    
-    # Close the cursor and connection
-    cur.close()
+    # Connect to PostgreSQL. connect_timeout keeps an unreachable host
+    # from hanging on the default ~2-minute TCP timeout.
+    conn = psycopg2.connect(db_connection_string, connect_timeout=3)
+
+    # server_version is populated during the handshake, so the
+    # connectivity check needs no query round trip at all
+    print(f"PostgreSQL server_version: {conn.server_version}")
+
+    # Close the connection
     conn.close()
     
     print("PostgreSQL connection successful!")